@@ -0,0 +1,91 @@
+"""
+typecast模块的调试辅助函数，仅用于手工运行：python -m lessweb._debug
+"""
+import sys
+from typing import List, Literal, NewType, Union, get_type_hints
+
+import typing_inspect
+
+from lessweb.typecast import is_list_type, issubclass_safe, typecast
+
+
+def echo_typing_inspect():
+    import typing
+    int_args = typing_inspect.get_args(int)
+    int_origin = typing_inspect.get_origin(int)
+    print(f'{int_args=}')  # int_args=()
+    print(f'{int_origin=}')  # int_origin=None
+    list_args = typing_inspect.get_args(list)
+    list_origin = typing_inspect.get_origin(list)
+    print(f'{list_args=}')  # list_args=()
+    print(f'{list_origin=}')  # list_origin=None
+    list_int_args = typing_inspect.get_args(list[int])
+    list_int_origin = typing_inspect.get_origin(list[int])
+    print(f'{list_int_args=}')  # list_int_args=(<class 'int'>,)
+    print(f'{list_int_origin=}')  # list_int_origin=<class 'list'>
+    if sys.version_info[:2] >= (3, 11):
+        int_optional_args = typing_inspect.get_args(int | None)
+        int_optional_origin = typing_inspect.get_origin(int | None)
+        is_optional = typing_inspect.is_optional_type(int | None)
+        # int_optional_args=(<class 'int'>, <class 'NoneType'>)
+        print(f'{int_optional_args=}')
+        print(f'{int_optional_origin=}')  # int_optional_origin=None
+        print(f'{is_optional=}')  # is_optional=True
+
+        union_optional_args = typing_inspect.get_args(int | str)
+        union_optional_origin = typing_inspect.get_origin(int | str)
+        # union_optional_args=(<class 'int'>, <class 'str'>)
+        print(f'{union_optional_args=}')
+        print(f'{union_optional_origin=}')  # union_optional_origin=None
+
+    union_optional_args = typing_inspect.get_args(Union[int, str])
+    union_optional_origin = typing_inspect.get_origin(Union[int, str])
+    # union_optional_args=(<class 'int'>, <class 'str'>)
+    print(f'{union_optional_args=}')
+    print(f'{union_optional_origin=}')  # union_optional_origin=typing.Union
+
+    literral_args = typing_inspect.get_args(Literal['a', 'b'])
+    literal_origin = typing_inspect.get_origin(Literal['a', 'b'])
+    print(f'{literral_args=}')  # literral_args=('a', 'b')
+    print(f'{literal_origin=}')  # literal_origin=typing.Literal
+
+    UserId = NewType('UserId', int)
+    newtype_args = typing_inspect.get_args(UserId)
+    newtype_origin = typing_inspect.get_origin(UserId)
+    print(f'{newtype_args=}')  # newtype_args=()
+    print(f'{newtype_origin=}')  # newtype_origin=None
+    # newtype.__supertype__=<class 'int'>
+    print(f'newtype.__supertype__={UserId.__supertype__}')  # type: ignore
+
+    class Pet(typing.TypedDict):
+        name: str
+        age: int
+    pet_optional_args = typing_inspect.get_args(Pet)
+    pet_optional_origin = typing_inspect.get_origin(Pet)
+    is_dict = issubclass_safe(Pet, dict)
+    print(f'{pet_optional_args=}')  # pet_optional_args=()
+    print(f'{pet_optional_origin=}')  # pet_optional_origin=None
+    # is_dict=True {'name': <class 'str'>, 'age': <class 'int'>} {}
+    print(f'{is_dict=} {get_type_hints(Pet)} {get_type_hints(dict)}')
+    is_list = issubclass_safe(list[int], list)
+    print(f'{is_list=}')  # is_list=False
+    # is_list=True
+    print(f'is_list={is_list_type(List[int])} {is_list_type(List)}')
+
+
+def test_typecast():
+    import typing
+
+    class Pet(typing.TypedDict):
+        name: str
+        size: list[int]
+        child: Union[list['test_typecast.<locals>.Pet'], None]  # type: ignore
+    data = {'name': 'duck', 'size': '10,20,15', 'child': [
+        {'name': 'duckII', 'size': '5,10,8', 'child': None}]}
+    pet = typecast(data, Pet)
+    print(pet)
+
+
+if __name__ == '__main__':
+    echo_typing_inspect()
+    # test_typecast()
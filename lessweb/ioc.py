@@ -1,8 +1,12 @@
+import codecs
+import functools
 import inspect
 import logging
 from dataclasses import is_dataclass
-from typing import (Annotated, Any, Awaitable, Callable, Dict, Optional, Tuple,
-                    Type, TypeVar, Union, get_origin, get_type_hints)
+from types import MappingProxyType
+from typing import (Annotated, Any, Awaitable, Callable, Dict, Mapping,
+                    Optional, Tuple, Type, TypeVar, Union, get_origin,
+                    get_type_hints)
 
 import orjson
 import pydantic
@@ -16,7 +20,7 @@ from lessweb.utils import absolute_ref
 
 ENDPOINT_TYPE = Callable[..., Awaitable[Any]]
 HANDLER_TYPE = Callable[[Request], Awaitable[Any]]
-REQUEST_STACK_VALUE = Union[str, dict, list, pydantic.BaseModel]
+REQUEST_STACK_VALUE = Union[str, bytes, dict, list, pydantic.BaseModel]
 ORJSON_OPTION = 0
 POSITIONAL_ONLY = 0
 KEYWORD_ONLY = 3
@@ -93,9 +97,9 @@ def annotated_origin(anno) -> Any:
     return anno
 
 
-def func_arg_spec(fn) -> Dict[str, Tuple]:
+def func_arg_spec(fn) -> Mapping[str, Tuple]:
     """
-    获取函数参数的类型、默认值和参数类型
+    获取函数参数的类型、默认值和参数类型，结果按函数缓存且只读
      - 如果参数没有指定类型，则返回Any
      - 如果参数的类型是Annotated，则返回Annotated的原始类型
 
@@ -115,6 +119,12 @@ def func_arg_spec(fn) -> Dict[str, Tuple]:
     """
     assert inspect.isfunction(fn), \
         f'{fn} is not a function or classmethod or staticmethod'
+    return _func_arg_spec(fn)
+
+
+# 公开函数本身不套lru_cache：被包装后inspect.isfunction()为False，scan_import()会漏掉它们
+@functools.lru_cache(maxsize=1024)
+def _func_arg_spec(fn) -> Mapping[str, Tuple]:
     arg_spec = {}  # name: (type_, default, kind)
     for name, param in inspect.signature(fn).parameters.items():
         arg_spec[name] = (
@@ -123,29 +133,46 @@ def func_arg_spec(fn) -> Dict[str, Tuple]:
             param.default,  # otherwise => inspect.Signature.empty
             param.kind  # 0=POSITIONAL_ONLY 1=POSITIONAL_OR_KEYWORD 2=VAR_POSITIONAL 3=KEYWORD_ONLY 4=VAR_KEYWORD
         )
-    return arg_spec
+    return MappingProxyType(arg_spec)
+
+
+@functools.lru_cache(maxsize=1024)
+def _annotated_type_hints(fn) -> Mapping[str, Any]:
+    """
+    get_type_hints(fn, include_extras=True)的缓存版本，参数与返回值的注解共用一次解析
+    """
+    return MappingProxyType(get_type_hints(fn, include_extras=True))
 
 
-def func_arg_annotated_metas(fn) -> Dict[str, Tuple]:
+def func_arg_annotated_metas(fn) -> Mapping[str, Tuple]:
     """
+    结果按函数缓存且只读
+
     Example:
     >>> def foo(a: Annotated[int, 'meta'], b: str=''):
     ...   pass
     ...
     >>> func_arg_annotated_metas(foo)
-    {'a': ('meta',)}
+    mappingproxy({'a': ('meta',)})
     """
+    return _func_arg_annotated_metas(fn)
+
+
+@functools.lru_cache(maxsize=1024)
+def _func_arg_annotated_metas(fn) -> Mapping[str, Tuple]:
     result = {}
-    for name, anno in get_type_hints(fn, include_extras=True).items():
+    for name, anno in _annotated_type_hints(fn).items():
         if name == 'return':
             continue
         if get_origin(anno) == Annotated:
             result[name] = anno.__metadata__
-    return result
+    return MappingProxyType(result)
 
 
 def func_annotated_metas(fn) -> Tuple[Type, Tuple]:
     """
+    结果按函数缓存
+
     Example:
     >>> def foo(a: int) -> Annotated[bool, 'meta']:
     ...   pass
@@ -153,14 +180,19 @@ def func_annotated_metas(fn) -> Tuple[Type, Tuple]:
     >>> func_annotated_metas(foo)
     (<class 'bool'>, ('meta',))
     """
-    anno = get_type_hints(fn, include_extras=True).get('return', Any)
+    return _func_annotated_metas(fn)
+
+
+@functools.lru_cache(maxsize=1024)
+def _func_annotated_metas(fn) -> Tuple[Type, Tuple]:
+    anno = _annotated_type_hints(fn).get('return', Any)
     if get_origin(anno) == Annotated:
         return anno.__origin__, anno.__metadata__
     else:
         return anno, tuple()
 
 
-def spawn_default_factory(arg_annotated_metas: Dict[str, Tuple], arg_name: str):
+def spawn_default_factory(arg_annotated_metas: Mapping[str, Tuple], arg_name: str):
     """
     Example:
     >>> def foo(a: Annotated(list, DefaultFactory(list), b: list):
@@ -330,10 +362,24 @@ def push_request_stack(request: Request, value: REQUEST_STACK_VALUE):
     request_stack.append(value)
 
 
+async def _read_request_body(request: Request) -> Union[str, bytes]:
+    """
+    未声明charset或声明为UTF-8时直接返回bytes，由orjson/pydantic解析；其他charset按声明解码为str
+    """
+    request_body = await request.read()
+    charset = request.charset
+    if charset is None or codecs.lookup(charset).name == 'utf-8':
+        return request_body
+    return request_body.decode(charset)
+
+
 def autowire_handler(sp_endpoint: ENDPOINT_TYPE, background: bool = False) -> HANDLER_TYPE:
     """
     创建handler的工厂函数，用于aiohttp的add_route
     """
+    text_response_metas = get_text_response_metas(sp_endpoint)
+    text_content_type = text_response_metas[0].content_type if text_response_metas else 'text/plain'
+
     async def aio_route_endpoint(request: Request) -> StreamResponse:
         args: list = []
         kwargs: Dict[str, Any] = {}
@@ -344,7 +390,7 @@ def autowire_handler(sp_endpoint: ENDPOINT_TYPE, background: bool = False) -> HA
                 request_stack = get_request_stack(request)
                 request_data: REQUEST_STACK_VALUE
                 if not args and not request_stack:
-                    request_data = await request.text()
+                    request_data = await _read_request_body(request)
                 elif not request_stack:
                     raise TypeError(
                         f'request stack is empty for param: {name}')
@@ -352,7 +398,7 @@ def autowire_handler(sp_endpoint: ENDPOINT_TYPE, background: bool = False) -> HA
                     request_data = request_stack.pop()
                 if inspect.isclass(depends_type) and issubclass(depends_type, pydantic.BaseModel):
                     try:
-                        if isinstance(request_data, str):
+                        if isinstance(request_data, (str, bytes)):
                             data_pydantic = depends_type.model_validate_json(
                                 request_data)
                         else:
@@ -364,7 +410,7 @@ def autowire_handler(sp_endpoint: ENDPOINT_TYPE, background: bool = False) -> HA
                             HTTPBadRequest, {'message': f'invalid request body: {e}'})
                 else:
                     try:
-                        if isinstance(request_data, str):
+                        if isinstance(request_data, (str, bytes)):
                             data_json = orjson.loads(request_data)
                         elif isinstance(request_data, pydantic.BaseModel):
                             data_json = dict(request_data)
@@ -410,11 +456,7 @@ def autowire_handler(sp_endpoint: ENDPOINT_TYPE, background: bool = False) -> HA
         elif result is None:
             return Response(status=204)
         else:
-            text_response_metas = get_text_response_metas(sp_endpoint)
-            if text_response_metas:
-                return Response(text=str(result), content_type=text_response_metas[0].content_type, charset='utf-8')
-            else:
-                return Response(text=str(result), content_type='text/plain', charset='utf-8')
+            return Response(text=str(result), content_type=text_content_type, charset='utf-8')
 
     if background:
         setattr(aio_route_endpoint, BACKGROUND_ANNOTAION_KEY, True)
@@ -1,28 +1,103 @@
 import csv
 import datetime
 import enum
+import functools
 import inspect
 import json
 import re
-import sys
-from typing import (Any, Dict, List, Literal, NewType, Type, Union,
-                    get_type_hints)
+from types import MappingProxyType
+from typing import (Any, Callable, Dict, FrozenSet, List, Literal, Mapping,
+                    NewType, Optional, Tuple, Type, Union, get_type_hints)
 from uuid import UUID
 
 import typing_inspect
 
 
+# BaseException在C层的args描述符，str()/repr()/pickle都直接读取它
+_EXCEPTION_ARGS: Any = BaseException.__dict__['args']
+
+
 class TypeCastError(Exception):
-    pass
+    """
+    TypeCastError.lazy(message_format, *params)构造的异常仅在读取args或str()/repr()时才执行format，
+    避免Union逐个尝试分支时反复对data做repr；直接构造时与普通Exception相同
+    """
+    __slots__ = ('_message_format', '_params')
+
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self._message_format: Optional[str] = None
+        self._params: Tuple[Any, ...] = ()
+
+    @classmethod
+    def lazy(cls, message_format: str, *params) -> 'TypeCastError':
+        error = cls()
+        error._message_format = message_format
+        error._params = params
+        return error
+
+    def _render(self) -> None:
+        if self._message_format is not None:
+            message = self._message_format.format(*self._params)
+            self._message_format = None
+            self._params = ()
+            _EXCEPTION_ARGS.__set__(self, (message,))
+
+    @property  # type: ignore[override]
+    def args(self) -> Tuple[Any, ...]:
+        self._render()
+        return _EXCEPTION_ARGS.__get__(self)
+
+    @args.setter
+    def args(self, value) -> None:
+        self._message_format = None
+        self._params = ()
+        _EXCEPTION_ARGS.__set__(self, value)
+
+    def __str__(self) -> str:
+        self._render()
+        return super().__str__()
+
+    def __repr__(self) -> str:
+        self._render()
+        return super().__repr__()
+
+    def __reduce__(self):
+        self._render()
+        return super().__reduce__()
 
 
 NoneType = type(None)
 
+_WORD_RE = re.compile(r'^\w*\Z')
+_MISSING = object()
 
-classname_dict: Dict[str, Type] = {}
 
+classname_dict: Dict[str, Type] = {}
 
-def parse_csv(csv_text):
+# 常见基础类型从字符串转换时直接查表，跳过inspect_type和后续的issubclass判断。
+# int/float/bool不在表中：它们按JSON解析后再做isinstance检查，int()/float()会多接受'1_000'、'nan'等写法
+_PRIMITIVE_DISPATCH: Dict[Any, Any] = {
+    str: str,
+    datetime.datetime: datetime.datetime.fromisoformat,
+    datetime.date: datetime.date.fromisoformat,
+    datetime.time: datetime.time.fromisoformat,
+}
+
+# 无论输入是什么类型都交给转换函数处理的叶子类型，枚举和子类在编译时用issubclass补充判断
+_LEAF_CONVERTERS: Dict[Any, Callable[[Any], Any]] = {
+    datetime.datetime: datetime.datetime.fromisoformat,
+    datetime.date: datetime.date.fromisoformat,
+    datetime.time: datetime.time.fromisoformat,
+    UUID: UUID,
+}
+
+
+def parse_csv(csv_text: str) -> List[str]:
+    if not csv_text:
+        return []
+    if '"' not in csv_text and '\n' not in csv_text and '\r' not in csv_text:
+        return csv_text.split(',')
     return list(csv.reader([csv_text]))[0]
 
 
@@ -34,16 +109,20 @@ def isclasses(*cls_list) -> bool:
 
 
 def issubclass_safe(x, tp_tuple) -> bool:
+    if not isinstance(x, type):
+        return False
     try:
         return issubclass(x, tp_tuple)
-    except:
+    except TypeError:  # 例如x为TypedDict，或tp_tuple为list[int]
         return False
 
 
 def isinstance_safe(x, tp_tuple) -> bool:
+    if tp_tuple is Any or tp_tuple is inspect.Signature.empty:
+        return True
     try:
-        return tp_tuple is Any or tp_tuple is inspect.Signature.empty or isinstance(x, tp_tuple)
-    except:
+        return isinstance(x, tp_tuple)
+    except TypeError:  # 例如TypedDict、list[int]不支持isinstance
         return False
 
 
@@ -60,6 +139,30 @@ def future_typed_dict_keys(tp):
         return None
 
 
+@functools.lru_cache(maxsize=None)
+def _type_hints_cached(tp) -> Mapping[str, Any]:
+    """
+    TypedDict的注解是静态的，get_type_hints()开销较大，按类型缓存结果。
+    结果会经inspect_type()返回给调用方，所以是只读的
+    """
+    return MappingProxyType(get_type_hints(tp))
+
+
+def _typeddict_keys(tp, type_args: Mapping[str, Any]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    返回TypedDict的(required_keys, none_default_keys)，
+    none_default_keys是类型为Optional、缺失时补None的必填字段
+    """
+    optional_keys = frozenset(getattr(tp, '__optional_keys__'))
+    if optional_keys:
+        required_keys = frozenset(type_args.keys()) - optional_keys
+    else:
+        required_keys = frozenset(getattr(tp, '__required_keys__', ()))
+    none_default_keys = frozenset(
+        key for key in required_keys if typing_inspect.is_optional_type(type_args[key]))
+    return required_keys, none_default_keys
+
+
 def is_typeddict(tp) -> bool:
     return issubclass_safe(tp, dict) and future_typed_dict_keys(tp)
 
@@ -83,12 +186,31 @@ def inspect_type(tp):
     """
     if isinstance_safe(tp, str):
         tp = classname_dict[tp]
+    try:
+        result = _inspect_type_by_id(id(tp), tp)
+    except TypeError:  # tp不可哈希，例如Literal[{'a': 1}]，只能不走缓存
+        result = _inspect_type_uncached(tp)
+    # 字符串引用总是指向最近一次inspect的同名TypedDict
+    if len(result) == 2 and result[0] is dict:
+        classname_dict[tp.__qualname__] = tp
+    return result
+
+
+@functools.lru_cache(maxsize=1024)
+def _inspect_type_by_id(tp_id: int, tp):
+    """
+    按类型对象本身缓存inspect_type()的结果。
+    Union/Literal的==会忽略参数顺序，所以缓存键带上id(tp)，保证命中的是同一个对象
+    """
+    return _inspect_type_uncached(tp)
+
+
+def _inspect_type_uncached(tp):
     tp_origin = typing_inspect.get_origin(tp)
     tp_args = typing_inspect.get_args(tp)
     if tp_origin is None and tp_args == ():
         if is_typeddict(tp):
-            classname_dict[tp.__qualname__] = tp
-            return dict, get_type_hints(tp)
+            return dict, _type_hints_cached(tp)
         elif hasattr(tp, '__supertype__'):
             return NewType, tp.__supertype__
         return (tp,)
@@ -101,21 +223,44 @@ def inspect_type(tp):
     raise NotImplementedError(f'cannot inspect type {tp=}')
 
 
+def unwrap_newtype(tp):
+    """
+    unwrap_newtype(NewType('B', NewType('A', int))) => int
+    """
+    while hasattr(tp, '__supertype__'):
+        tp = tp.__supertype__
+    return tp
+
+
 def is_list_type(tp):
     return tp is list or typing_inspect.get_origin(tp) is list
 
 
-def semi_json_schema_type(tp):
+def semi_json_schema_type(tp) -> Mapping[str, Any]:
     """
     semi_json_schema_type(list) => {'type': 'array'}
     semi_json_schema_type(list[int]) => {'type': 'array', 'items': {'type': int}}
     semi_json_schema_type(Union[int, None]) => {'type': int, 'optional': True}
-    semi_json_schema_type(Union[int, str]) => {'union': [{'type': int}, {'type': str}], 'optional': False}
-    semi_json_schema_type(Union[None, int, str]) => {'union': [{'type': int}, {'type': str}], 'optional': True}
-    semi_json_schema_type(Literal['a', 'b']) => {'enum': ['a', 'b']}
+    semi_json_schema_type(Union[int, str]) => {'union': ({'type': int}, {'type': str}), 'optional': False}
+    semi_json_schema_type(Union[None, int, str]) => {'union': ({'type': int}, {'type': str}), 'optional': True}
+    semi_json_schema_type(Literal['a', 'b']) => {'enum': ('a', 'b')}
     semi_json_schema_type(Any) => {}
     semi_json_schema_type(cls) => {'type': cls}
+
+    结果按类型缓存并被所有调用方共享，所以整棵结果都是只读的：dict为MappingProxyType，union/enum为tuple
     """
+    try:
+        return _semi_json_schema_type_by_id(id(tp), tp)
+    except TypeError:  # tp不可哈希
+        return MappingProxyType(_build_semi_json_schema_type(tp))
+
+
+@functools.lru_cache(maxsize=1024)
+def _semi_json_schema_type_by_id(tp_id: int, tp) -> Mapping[str, Any]:
+    return MappingProxyType(_build_semi_json_schema_type(tp))
+
+
+def _build_semi_json_schema_type(tp) -> Dict[str, Any]:
     origin_type, *type_args_wrapped = inspect_type(tp)
     if not type_args_wrapped:
         if origin_type == list:
@@ -138,187 +283,297 @@ def semi_json_schema_type(tp):
         if len(type_args_list) == 1:
             return {**semi_json_schema_type(type_args_list[0]), 'optional': is_optional}
         else:
-            return {'union': [semi_json_schema_type(item) for item in type_args_list], 'optional': is_optional}
+            return {'union': tuple(semi_json_schema_type(item) for item in type_args_list), 'optional': is_optional}
     elif origin_type == Literal:
-        return {'enum': list(type_args)}
+        return {'enum': tuple(type_args)}
     else:
         return {'type': tp}
 
 
-def typecast(data, tp):
-    if isinstance_safe(tp, str):
-        if tp not in classname_dict:
-            raise TypeCastError(
-                f'typename {tp=} is not valid ref')  # 5xx Error in fact
+def _identity(data):
+    return data
+
+
+def _loads_str(data: str, tp):
+    try:  # 不用orjson：它不接受NaN/Infinity，并会把超出64位的整数转成float
+        return json.loads(data)
+    except ValueError:
+        if _WORD_RE.match(data):
+            raise TypeCastError.lazy(
+                'data={!r} is not an instance of tp={!r}', data, tp)
         else:
-            tp = classname_dict[tp]
-    type_inspect_seed = inspect_type(tp)
-    if type_inspect_seed[0] == Union:
-        if len(type_inspect_seed) != 2 or not type_inspect_seed[1]:
-            raise TypeCastError(f'{tp=} is empty')  # 5xx Error in fact
-        for item in type_inspect_seed[1]:
+            raise
+
+
+def _union_discriminator(type_args) -> Optional[Tuple[str, Dict[Any, Any]]]:
+    """
+    除None外所有分支都是TypedDict，且某个必填字段在各分支中都是取值互不相交的Literal时，
+    返回(字段名, {Literal取值: 分支})，否则返回None。None分支由cast_union提前处理
+    """
+    type_args = [arm for arm in type_args if arm is not NoneType]
+    if not type_args:
+        return None
+    arm_literals = []
+    for arm in type_args:
+        required_keys = getattr(arm, '__required_keys__', None)
+        if not is_typeddict(arm) or required_keys is None:
+            return None
+        _, type_hints = inspect_type(arm)
+        arm_literals.append({
+            key: typing_inspect.get_args(type_hints[key])
+            for key in required_keys
+            if typing_inspect.get_origin(type_hints[key]) is Literal
+        })
+    for key in arm_literals[0]:
+        discriminator_map: Dict[Any, Any] = {}
+        for arm, literals in zip(type_args, arm_literals):
+            if key not in literals or any(value in discriminator_map for value in literals[key]):
+                break
+            for value in literals[key]:
+                discriminator_map[value] = arm
+        else:
+            return key, discriminator_map
+    return None
+
+
+def _union_leaf_types(type_args) -> FrozenSet[type]:
+    """
+    返回可直接命中的叶子分支：data的类型恰为该分支且不会被其前面的分支先接受或转换时，
+    直接原样返回data。前面的分支只允许是无转换器的普通类（对非str数据只做isinstance），
+    str分支则要求前面没有其他分支
+    """
+    leaf_types = set()
+    has_prior_arm = False
+    for arm in type_args:
+        if arm is NoneType:
+            continue
+        if not isinstance(arm, type) or inspect_type(arm) != (arm,) \
+                or _leaf_converter(arm) is not None:
+            break
+        if arm is not str or not has_prior_arm:
+            leaf_types.add(arm)
+        has_prior_arm = True
+    return frozenset(leaf_types)
+
+
+def _compile_union_validator(tp, type_args) -> Callable[[Any], Any]:
+    is_optional = NoneType in type_args
+    discriminator = _union_discriminator(type_args)
+    leaf_types = _union_leaf_types(type_args)
+
+    def cast_union(data):
+        if data is None and is_optional:
+            return None
+        if type(data) in leaf_types:
+            return data
+        if discriminator is not None and isinstance(data, dict):
+            discriminator_key, discriminator_map = discriminator
+            try:
+                arm = discriminator_map.get(
+                    data.get(discriminator_key, _MISSING))
+            except TypeError:  # 字段值不可哈希
+                arm = None
+            if arm is not None:
+                try:
+                    return typecast(data, arm)
+                except Exception:
+                    raise TypeCastError.lazy(
+                        'data={!r} is not any member of tp={!r}', data, tp)
+        for item in type_args:
             try:
                 return typecast(data, item)
-            except:
+            except Exception:
                 continue
-        raise TypeCastError(f'{data=} is not any member of {tp=}')
-    elif type_inspect_seed[0] == Literal:
-        if len(type_inspect_seed) != 2 or not type_inspect_seed[1]:
-            raise TypeCastError(f'{tp=} is empty')  # 5xx Error in fact
-        for item in type_inspect_seed[1]:
-            if item == data:
-                return data
-        raise TypeCastError(f'{data=} is not member of {tp=}')
-    elif type_inspect_seed[0] == NewType:
-        return typecast(data, type_inspect_seed[1])
-    if isinstance_safe(data, tp):
-        return data
+        raise TypeCastError.lazy(
+            'data={!r} is not any member of tp={!r}', data, tp)
+    return cast_union
+
+
+def _compile_literal_validator(tp, members) -> Callable[[Any], Any]:
+    try:
+        member_set = frozenset(members)
+    except TypeError:  # Literal的取值不可哈希时只能逐个比较
+        member_set = None
+
+    def cast_literal(data):
+        if member_set is not None:
+            try:
+                if data in member_set:
+                    return data
+            except TypeError:  # data不可哈希，不可能等于任何Literal取值
+                pass
+        else:
+            for item in members:
+                if item == data:
+                    return data
+        raise TypeCastError.lazy(
+            'data={!r} is not member of tp={!r}', data, tp)
+    return cast_literal
+
+
+def _compile_list_validator(tp, item_tp) -> Callable[[Any], Any]:
+    item_cast = _PRIMITIVE_DISPATCH.get(item_tp)
+    item_validator: Optional[Callable[[Any], Any]] = None
+
+    def cast_list(data):
+        nonlocal item_validator
+        is_csv = isinstance(data, str)
+        if is_csv:
+            items = parse_csv(data)
+            if item_cast is not None:  # 日期时间格式错误时与其他输入一样抛出ValueError
+                return list(map(item_cast, items))
+            data = items
+        assert isinstance(data, list)
+        if isinstance(item_tp, str):
+            return [typecast(item, item_tp) for item in data]
+        if item_validator is None:  # 首次使用时才编译，元素类型不受支持时空列表仍可通过
+            item_validator = _get_validator(item_tp)
+        if is_csv:  # CSV元素都是str，而str元素类型已由item_cast处理，无需逐个比较类型
+            return list(map(item_validator, data))
+        return [item if type(item) is item_tp else item_validator(item) for item in data]
+    return cast_list
+
+
+def _compile_typeddict_validator(tp, type_args) -> Callable[[Any], Any]:
+    required_keys, none_default_keys = _typeddict_keys(tp, type_args)
+    # 字段首次出现时才编译，递归TypedDict此时已在缓存中
+    field_validators: Dict[str, Callable[[Any], Any]] = {}
+
+    def cast_typeddict(data):
+        classname_dict[tp.__qualname__] = tp  # 与inspect_type()一致，每次转换都重新登记
+        if isinstance(data, str):
+            return cast_typeddict(_loads_str(data, tp))
+        assert isinstance(data, dict)
+        missing_keys = required_keys.difference(data)
+        result = {}
+        for item_key, item_value in data.items():
+            item_tp = type_args.get(item_key)
+            if item_tp is None:
+                raise TypeCastError.lazy(
+                    'item_key={!r} is not member of tp={!r}', item_key, tp)
+            if type(item_value) is item_tp:
+                result[item_key] = item_value
+                continue
+            item_validator = field_validators.get(item_key)
+            if item_validator is None:
+                item_validator = _get_validator(item_tp)
+                field_validators[item_key] = item_validator
+            result[item_key] = item_validator(item_value)
+        if missing_keys:
+            if missing_keys - none_default_keys:
+                raise TypeCastError(
+                    f'missing required keys {list(missing_keys - none_default_keys)}')
+            for item_key in missing_keys:
+                result[item_key] = None
+        return result
+    return cast_typeddict
+
+
+def _enum_converter(tp) -> Callable[[Any], Any]:
+    """
+    先查_value2member_map_，未命中（含不可哈希的值）再交给tp(data)处理_missing_等情况
+    """
+    value2member_map = getattr(tp, '_value2member_map_', None)
+    if value2member_map is None:
+        return tp
+
+    def convert_enum(data):
+        try:
+            return value2member_map[data]
+        except (KeyError, TypeError):
+            return tp(data)
+    return convert_enum
+
+
+def _leaf_converter(tp) -> Optional[Callable[[Any], Any]]:
+    convert = _LEAF_CONVERTERS.get(tp)
+    if convert is not None:
+        return convert
     elif issubclass_safe(tp, enum.Enum):
-        return tp(data)
-    elif issubclass_safe(tp, datetime.datetime):
-        return datetime.datetime.fromisoformat(data)
-    elif issubclass_safe(tp, datetime.date):
-        return datetime.date.fromisoformat(data)
-    elif issubclass_safe(tp, datetime.time):
-        return datetime.time.fromisoformat(data)
+        return _enum_converter(tp)
     elif issubclass_safe(tp, UUID):
-        return tp(data)
-    elif isinstance(data, str):
-        if issubclass_safe(tp, str):
-            return tp(data)
-        elif is_list_type(tp):
-            data = parse_csv(data)
-            return typecast(data, tp)
+        return tp
+    for base_type in (datetime.datetime, datetime.date, datetime.time):
+        if issubclass_safe(tp, base_type):
+            return _LEAF_CONVERTERS[base_type]
+    return None
+
+
+def _compile_class_validator(tp) -> Callable[[Any], Any]:
+    primitive_cast = _PRIMITIVE_DISPATCH.get(tp)
+    convert = _leaf_converter(tp)
+    is_str_type = issubclass_safe(tp, str)
+
+    def cast_class(data):
+        if primitive_cast is not None and type(data) is str:
+            return primitive_cast(data)
+        try:
+            if isinstance(data, tp):
+                return data
+        except TypeError:  # tp不支持isinstance，例如非runtime的Protocol
+            pass
+        if convert is not None:
+            return convert(data)
+        elif isinstance(data, str):
+            if is_str_type:
+                return tp(data)
+            elif tp is list:
+                return parse_csv(data)
+            else:
+                return cast_class(_loads_str(data, tp))
+        raise TypeCastError.lazy(
+            'data={!r} is not instance of tp={!r}', data, tp)
+    return cast_class
+
+
+def _compile_validator(tp) -> Callable[[Any], Any]:
+    """
+    根据inspect_type(tp)的结果一次性选定转换逻辑，生成专用于tp的闭包。
+    子类型仍通过typecast()转换，因此递归的TypedDict不会在编译时无限展开
+    """
+    type_inspect_seed = inspect_type(tp)
+    origin_type = type_inspect_seed[0]
+    if origin_type is Union or origin_type is Literal:
+        if len(type_inspect_seed) != 2 or not type_inspect_seed[1]:
+            raise TypeCastError(f'{tp=} is empty')  # 5xx Error in fact
+        if origin_type is Union:
+            return _compile_union_validator(tp, type_inspect_seed[1])
         else:
-            try:
-                loaded_data = json.loads(data)
-            except:
-                if re.match(r'^\w*$', data):
-                    raise TypeCastError(f'{data=} is not an instance of {tp=}')
-                else:
-                    raise
-            return typecast(loaded_data, tp)
-    else:
-        if len(type_inspect_seed) != 2:
-            raise TypeCastError(f'{data=} is not instance of {tp=}')
-        origin_type, type_args = type_inspect_seed
+            return _compile_literal_validator(tp, type_inspect_seed[1])
+    elif origin_type is NewType:
+        return _get_validator(unwrap_newtype(tp))
+    elif tp is Any or tp is inspect.Signature.empty:
+        return _identity
+    elif len(type_inspect_seed) == 2:
         if origin_type is list:
-            assert isinstance(data, list)
-            return [typecast(item, type_args) for item in data]
-        elif origin_type == Union:
-            error_list = []
-            for type_arg in type_args:
-                try:
-                    return typecast(data, type_arg)
-                except Exception as e:
-                    error_list.append(str(e))
+            return _compile_list_validator(tp, type_inspect_seed[1])
+        else:
+            return _compile_typeddict_validator(tp, type_inspect_seed[1])
+    else:
+        return _compile_class_validator(tp)
+
+
+@functools.lru_cache(maxsize=1024)
+def _validator_by_id(tp_id: int, tp) -> Callable[[Any], Any]:
+    return _compile_validator(tp)
+
+
+def _get_validator(tp) -> Callable[[Any], Any]:
+    try:
+        return _validator_by_id(id(tp), tp)
+    except TypeError:  # tp不可哈希，例如Literal[{'a': 1}]，每次重新编译
+        return _compile_validator(tp)
+
+
+def typecast(data, tp):
+    if type(data) is tp:  # tp为字符串引用时不可能命中，可以先于引用解析
+        return data
+    if isinstance(tp, str):
+        if tp not in classname_dict:
             raise TypeCastError(
-                f'{data=} is not any instance of {tp=}: ' + '; '.join(error_list))
-        elif origin_type == dict:
-            assert isinstance(data, dict)
-            optional_keys = getattr(tp, '__optional_keys__')
-            if optional_keys:
-                required_keys = set(type_args.keys()) - optional_keys
-            else:
-                required_keys = getattr(tp, '__required_keys__', set())
-            missing_keys = required_keys - set(data.keys())
-            none_value_keys = set()
-            result = {}
-            for item_key, item_value in data.items():
-                if item_key not in type_args:
-                    raise TypeCastError(
-                        f'{item_key=} is not member of {tp=}')
-                result[item_key] = typecast(
-                    item_value, type_args[item_key])
-            for item_key in missing_keys:
-                if typing_inspect.is_optional_type(type_args[item_key]):
-                    result[item_key] = None
-                    none_value_keys.add(item_key)
-            if missing_keys - none_value_keys:
-                raise TypeCastError(
-                    f'missing required keys {list(missing_keys - none_value_keys)}')
-            return result
+                f'typename {tp=} is not valid ref')  # 5xx Error in fact
         else:
-            raise TypeCastError(f'type {tp=} is not supported ({data=})')
-
-
-def echo_typing_inspect():
-    import typing
-    int_args = typing_inspect.get_args(int)
-    int_origin = typing_inspect.get_origin(int)
-    print(f'{int_args=}')  # int_args=()
-    print(f'{int_origin=}')  # int_origin=None
-    list_args = typing_inspect.get_args(list)
-    list_origin = typing_inspect.get_origin(list)
-    print(f'{list_args=}')  # list_args=()
-    print(f'{list_origin=}')  # list_origin=None
-    list_int_args = typing_inspect.get_args(list[int])
-    list_int_origin = typing_inspect.get_origin(list[int])
-    print(f'{list_int_args=}')  # list_int_args=(<class 'int'>,)
-    print(f'{list_int_origin=}')  # list_int_origin=<class 'list'>
-    if sys.version_info[:2] >= (3, 11):
-        int_optional_args = typing_inspect.get_args(int | None)
-        int_optional_origin = typing_inspect.get_origin(int | None)
-        is_optional = typing_inspect.is_optional_type(int | None)
-        # int_optional_args=(<class 'int'>, <class 'NoneType'>)
-        print(f'{int_optional_args=}')
-        print(f'{int_optional_origin=}')  # int_optional_origin=None
-        print(f'{is_optional=}')  # is_optional=True
-
-        union_optional_args = typing_inspect.get_args(int | str)
-        union_optional_origin = typing_inspect.get_origin(int | str)
-        # union_optional_args=(<class 'int'>, <class 'str'>)
-        print(f'{union_optional_args=}')
-        print(f'{union_optional_origin=}')  # union_optional_origin=None
-
-    union_optional_args = typing_inspect.get_args(Union[int, str])
-    union_optional_origin = typing_inspect.get_origin(Union[int, str])
-    # union_optional_args=(<class 'int'>, <class 'str'>)
-    print(f'{union_optional_args=}')
-    print(f'{union_optional_origin=}')  # union_optional_origin=typing.Union
-
-    literral_args = typing_inspect.get_args(Literal['a', 'b'])
-    literal_origin = typing_inspect.get_origin(Literal['a', 'b'])
-    print(f'{literral_args=}')  # literral_args=('a', 'b')
-    print(f'{literal_origin=}')  # literal_origin=typing.Literal
-
-    UserId = NewType('UserId', int)
-    newtype_args = typing_inspect.get_args(UserId)
-    newtype_origin = typing_inspect.get_origin(UserId)
-    print(f'{newtype_args=}')  # newtype_args=()
-    print(f'{newtype_origin=}')  # newtype_origin=None
-    # newtype.__supertype__=<class 'int'>
-    print(f'newtype.__supertype__={UserId.__supertype__}')  # type: ignore
-
-    class Pet(typing.TypedDict):
-        name: str
-        age: int
-    pet_optional_args = typing_inspect.get_args(Pet)
-    pet_optional_origin = typing_inspect.get_origin(Pet)
-    is_dict = issubclass_safe(Pet, dict)
-    print(f'{pet_optional_args=}')  # pet_optional_args=()
-    print(f'{pet_optional_origin=}')  # pet_optional_origin=None
-    # is_dict=True {'name': <class 'str'>, 'age': <class 'int'>} {}
-    print(f'{is_dict=} {get_type_hints(Pet)} {get_type_hints(dict)}')
-    is_list = issubclass_safe(list[int], list)
-    print(f'{is_list=}')  # is_list=False
-    # is_list=True
-    print(f'is_list={is_list_type(List[int])} {is_list_type(List)}')
-
-
-def test_typecast():
-    import typing
-
-    class Pet(typing.TypedDict):
-        name: str
-        size: list[int]
-        child: Union[list['test_typecast.<locals>.Pet'], None]  # type: ignore
-    data = {'name': 'duck', 'size': '10,20,15', 'child': [
-        {'name': 'duckII', 'size': '5,10,8', 'child': None}]}
-    pet = typecast(data, Pet)
-    print(pet)
-
-
-if __name__ == '__main__':
-    echo_typing_inspect()
-    # test_typecast()
+            tp = classname_dict[tp]
+        if type(data) is tp:
+            return data
+    return _get_validator(tp)(data)
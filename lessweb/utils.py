@@ -1,6 +1,7 @@
 import importlib
 import inspect
 import os
+import pkgutil
 from typing import Any, Callable, Union
 
 
@@ -26,6 +27,22 @@ def list_files(path: str) -> list[str]:
     return [f for f in os.listdir(path) if os.path.isfile(os.path.join(path, f))]
 
 
+def _import_on_error(name: str) -> None:
+    """
+    pkgutil.walk_packages()导入子包出现ImportError时只回调onerror(name)后继续，这里重新导入让真实错误抛出
+    """
+    importlib.import_module(name)
+
+
+def _is_source_module(module_info: pkgutil.ModuleInfo) -> bool:
+    """
+    只扫描.py源码模块（包则要求有__init__.py），跳过.so扩展和只有.pyc的模块
+    """
+    finder: Any = module_info.module_finder
+    spec = finder.find_spec(module_info.name)
+    return spec is not None and spec.origin is not None and spec.origin.endswith('.py')
+
+
 def scan_import(packages: tuple[Union[str, Callable]]) -> dict[str, Any]:
     """
     Example:
@@ -33,6 +50,7 @@ def scan_import(packages: tuple[Union[str, Callable]]) -> dict[str, Any]:
     {'myapp.utils.Cls1': <class 'myapp.utils.Cls1'>, 'myapp.utils.Cls2': <class 'myapp.utils.Cls2'>}
     """
     result: dict[str, Any] = {}
+    seen_ids: set[int] = set()
     for package_name in packages:
         if not isinstance(package_name, str):
             obj = package_name
@@ -42,20 +60,24 @@ def scan_import(packages: tuple[Union[str, Callable]]) -> dict[str, Any]:
             continue
         imported_module = importlib.import_module(package_name)
         assert imported_module.__spec__ and imported_module.__spec__.submodule_search_locations
-        package_path = imported_module.__spec__.submodule_search_locations[0]
-        for filename in list_files(package_path):
-            if filename.endswith('.py'):
-                sub_module = importlib.import_module(
-                    f'{package_name}.{filename[:-3]}')
-                for obj in sub_module.__dict__.values():
-                    if inspect.isclass(obj) or inspect.isfunction(obj):
-                        obj_ref = absolute_ref(obj)
-                        result[obj_ref] = obj
-        for dirname in list_dirs(package_path):
-            if '.' not in dirname and os.path.isfile(os.path.join(package_path, f'{dirname}/__init__.py')):
-                imported_sub_modules = scan_import(
-                    (f'{package_name}.{dirname}', ))
-                result.update(imported_sub_modules)
+        sub_modules = [imported_module]
+        skipped_prefixes: tuple[str, ...] = ()
+        for module_info in pkgutil.walk_packages(
+                imported_module.__path__, prefix=f'{package_name}.', onerror=_import_on_error):
+            if module_info.name.startswith(skipped_prefixes):
+                continue
+            if not _is_source_module(module_info):
+                skipped_prefixes += (f'{module_info.name}.',)  # 非源码包下的模块也一并跳过
+                continue
+            sub_modules.append(importlib.import_module(module_info.name))
+        for sub_module in sub_modules:
+            for obj in vars(sub_module).values():
+                if id(obj) in seen_ids:  # 被多个模块导入的同一对象只处理一次
+                    continue
+                seen_ids.add(id(obj))
+                if inspect.isclass(obj) or inspect.isfunction(obj):
+                    obj_ref = absolute_ref(obj)
+                    result[obj_ref] = obj
     return result
 
 
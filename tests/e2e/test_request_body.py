@@ -0,0 +1,41 @@
+from typing import Annotated
+
+import pydantic
+import pytest
+from aiohttp import web
+
+from lessweb import Bridge
+from lessweb.annotation import Post
+
+
+class UserVo(pydantic.BaseModel):
+    name: str
+
+
+async def post_echo(vo, /) -> Annotated[dict, Post('/echo')]:
+    return {'data': vo}
+
+
+async def post_user(user: UserVo, /) -> Annotated[dict, Post('/user')]:
+    return {'name': user.name}
+
+
+@pytest.mark.asyncio
+async def test_request_body(aiohttp_client):
+    app = web.Application()
+    bridge = Bridge(app=app)
+    bridge.scan(post_echo, post_user)
+    client = await aiohttp_client(app)
+    resp = await client.post('/echo', json={'name': '鸭子'})
+    assert resp.status == 200
+    assert await resp.json() == {'data': {'name': '鸭子'}}
+
+    for path, expected in [('/echo', {'data': {'name': '鸭子'}}), ('/user', {'name': '鸭子'})]:
+        resp = await client.post(path, data='{"name": "鸭子"}'.encode('gbk'),
+                                 headers={'Content-Type': 'application/json; charset=gbk'})
+        assert resp.status == 200
+        assert await resp.json() == expected
+
+    resp = await client.post('/echo', data=b'{"name": ',
+                             headers={'Content-Type': 'application/json'})
+    assert resp.status == 400
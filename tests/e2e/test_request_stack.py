@@ -1,5 +1,6 @@
 from typing import Annotated
 
+import orjson
 import pytest
 from aiohttp import web
 from aiohttp.web import HTTPInternalServerError, Request
@@ -33,10 +34,11 @@ class UpperFilter(Middleware):
         self.upper_service = upper_service
 
     async def on_request(self, request: Request, handler):
-        raw_request = await request.json()
-        push_request_stack(request, raw_request.copy())
-        raw_request['name'] = self.upper_service.upper(raw_request['name'])
-        push_request_stack(request, raw_request.copy())
+        raw_request = await request.read()
+        push_request_stack(request, raw_request)
+        request_obj = orjson.loads(raw_request)
+        request_obj['name'] = self.upper_service.upper(request_obj['name'])
+        push_request_stack(request, orjson.dumps(request_obj))
         try:
             return await handler(request)
         except TypeError as e:
@@ -1,4 +1,4 @@
-from inspect import Parameter
+from inspect import Parameter, isfunction
 from typing import Annotated, Any
 
 import pytest
@@ -287,3 +287,17 @@ def test_func_arg_spec_not_function():
     with pytest.raises(AssertionError) as exc_info:
         func_arg_spec(NotAFunction())
     assert "is not a function" in str(exc_info.value)
+
+
+def test_func_arg_spec_cached_readonly():
+    def foo(a: Annotated[int, 'meta']):
+        pass
+
+    spec = func_arg_spec(foo)
+    assert func_arg_spec(foo) is spec
+    assert func_arg_annotated_metas(foo) is func_arg_annotated_metas(foo)
+    with pytest.raises(TypeError):
+        spec['b'] = spec['a']  # type: ignore
+    assert isfunction(func_arg_spec)
+    assert isfunction(func_arg_annotated_metas)
+    assert isfunction(func_annotated_metas)
@@ -1,3 +1,4 @@
+import copy
 import sys
 import unittest
 from datetime import date, datetime, time
@@ -6,7 +7,8 @@ from typing import (Any, Dict, Generator, List, Literal, NewType, Optional,
                     TypedDict, Union)
 from uuid import UUID
 
-from lessweb.typecast import (TypeCastError, inspect_type,
+from lessweb.typecast import (TypeCastError, inspect_type, isinstance_safe,
+                              issubclass_safe, parse_csv,
                               semi_json_schema_type, typecast)
 
 NoneType = type(None)
@@ -17,11 +19,28 @@ class SampleTypedDict(TypedDict):
     age: int
 
 
+class SampleTree(TypedDict):
+    name: str
+    size: list[int]
+    child: Optional[list['SampleTree']]
+
+
+class SampleCat(TypedDict):
+    kind: Literal['cat']
+    lives: int
+
+
+class SampleDog(TypedDict):
+    kind: Literal['dog', 'puppy']
+    name: str
+
+
 class SampleElse:
     pass
 
 
 UserId = NewType('UserId', int)
+AdminId = NewType('AdminId', UserId)
 
 
 class TestInspectType(unittest.TestCase):
@@ -51,6 +70,19 @@ class TestInspectType(unittest.TestCase):
         self.assertEqual(inspect_type(SampleElse), (SampleElse,))
         self.assertRaises(NotImplementedError, inspect_type, Generator)
 
+    def test_inspect_typeddict_readonly(self):
+        _, type_hints = inspect_type(SampleTypedDict)
+        with self.assertRaises(TypeError):
+            type_hints['age'] = str  # type: ignore
+        self.assertEqual(typecast({'name': 'a', 'age': '3'}, SampleTypedDict),
+                         {'name': 'a', 'age': 3})
+
+    def test_inspect_type_keeps_arg_order(self):
+        self.assertEqual(inspect_type(Union[int, str]), (Union, (int, str)))
+        self.assertEqual(inspect_type(Union[str, int]), (Union, (str, int)))
+        self.assertEqual(inspect_type(
+            Literal['b', 'a']), (Literal, ('b', 'a')))
+
 
 class SampleEnum(Enum):
     VALUE1 = 'V1'
@@ -81,6 +113,10 @@ class TestTypecast(unittest.TestCase):
         tp = date
         result = typecast(data, tp)
         self.assertEqual(result, date.fromisoformat(data))
+        with self.assertRaisesRegex(ValueError, 'Invalid isoformat string'):
+            typecast('yesterday', tp)
+        with self.assertRaisesRegex(ValueError, 'Invalid isoformat string'):
+            typecast('2022-01-01,yesterday', list[date])
 
     def test_typecast_time(self):
         data = "12:00:00"
@@ -100,11 +136,55 @@ class TestTypecast(unittest.TestCase):
         result = typecast(data, tp)
         self.assertEqual(result, data)
 
+    def test_typecast_number(self):
+        self.assertEqual(typecast('-3', int), -3)
+        self.assertEqual(typecast('12.5', float), 12.5)
+        for data in ('1_000', 'nan', 'inf', '١٢', '12.0'):
+            with self.assertRaises(TypeCastError):
+                typecast(data, int)
+        with self.assertRaises(TypeCastError):
+            typecast('5', float)
+        result = typecast('5', Union[float, int])
+        self.assertEqual((result, type(result)), (5, int))
+
+    def test_typecast_bool(self):
+        self.assertIs(typecast('true', bool), True)
+        self.assertIs(typecast('false', bool), False)
+        for data in ('True', 'FALSE', 'tRuE', '1', '0', 'yes'):
+            with self.assertRaises(TypeCastError):
+                typecast(data, bool)
+        with self.assertRaises(ValueError):
+            typecast('✔', bool)
+        self.assertEqual(typecast('1', Union[bool, int]), 1)
+
     def test_typecast_list(self):
         data = "1,2,3"
         tp = List[int]
         result = typecast(data, tp)
         self.assertEqual(result, [1, 2, 3])
+        self.assertEqual(typecast('V2,V1', list[SampleEnum]),
+                         [SampleEnum.VALUE2, SampleEnum.VALUE1])
+
+    def test_typecast_typeddict(self):
+        data = {'name': 'duck', 'age': '3'}
+        tp = SampleTypedDict
+        result = typecast(data, tp)
+        self.assertEqual(result, {'name': 'duck', 'age': 3})
+        result = typecast('{"name": "duck", "age": 3}', tp)
+        self.assertEqual(result, {'name': 'duck', 'age': 3})
+        with self.assertRaises(TypeCastError):
+            typecast({'name': 'duck'}, tp)
+        with self.assertRaises(TypeCastError):
+            typecast({'name': 'duck', 'age': 3, 'color': 'red'}, tp)
+
+    def test_typecast_recursive_typeddict(self):
+        data = {'name': 'duck', 'size': '10,20', 'child': [
+            {'name': 'duckII', 'size': '5', 'child': None}]}
+        result = typecast(data, SampleTree)
+        self.assertEqual(result, {'name': 'duck', 'size': [10, 20], 'child': [
+            {'name': 'duckII', 'size': [5], 'child': None}]})
+        self.assertEqual(typecast({'name': 'a', 'size': []}, SampleTree),
+                         {'name': 'a', 'size': [], 'child': None})
 
     def test_typecast_dict_missing_required_keys(self):
         data = '{"age": 25}'
@@ -136,6 +216,14 @@ class TestTypecast(unittest.TestCase):
         except TypeCastError as e:
             self.assertEqual(str(e), f'{tp=} is empty')
 
+    def test_typecast_unhashable_literal(self):
+        tp = Literal[{'a': 1}]  # type: ignore
+        self.assertEqual(inspect_type(tp), (Literal, ({'a': 1},)))
+        self.assertEqual(typecast({'a': 1}, tp), {'a': 1})
+        with self.assertRaises(TypeCastError):
+            typecast({'a': 2}, tp)
+        self.assertEqual(semi_json_schema_type(tp), {'enum': ({'a': 1},)})
+
     def test_typecast_union(self):
         data = "10"
         tp = Union[int, list[int]]
@@ -147,6 +235,41 @@ class TestTypecast(unittest.TestCase):
         data = "12.3"
         with self.assertRaises(TypeCastError):
             typecast(data, tp)
+        self.assertEqual(typecast(5, Union[str, int]), 5)
+        self.assertEqual(typecast('5', Union[int, str]), 5)
+        self.assertEqual(typecast('5', Union[SampleEnum, str]), '5')
+        self.assertEqual(typecast('V1', Union[SampleEnum, str]),
+                         SampleEnum.VALUE1)
+
+    def test_typecast_same_qualname_typeddict(self):
+        def make_node(value_tp):
+            class Node(TypedDict):
+                value: value_tp  # type: ignore
+            return Node
+        IntNode, StrNode = make_node(int), make_node(str)
+        data = {'value': '1'}
+        typecast(data, IntNode)
+        typecast(data, StrNode)
+        typecast(data, IntNode)
+        self.assertEqual(typecast(data, IntNode.__qualname__), {'value': 1})
+        inspect_type(StrNode)
+        self.assertEqual(typecast(data, StrNode.__qualname__), {'value': '1'})
+
+    def test_typecast_discriminated_union(self):
+        tp = Union[SampleCat, SampleDog]
+        self.assertEqual(typecast({'kind': 'puppy', 'name': 'rex'}, tp),
+                         {'kind': 'puppy', 'name': 'rex'})
+        self.assertEqual(typecast({'kind': 'cat', 'lives': '9'}, tp),
+                         {'kind': 'cat', 'lives': 9})
+        with self.assertRaises(TypeCastError):
+            typecast({'kind': 'cat', 'name': 'rex'}, tp)
+        with self.assertRaises(TypeCastError):
+            typecast({'kind': 'cow'}, tp)
+        self.assertIsNone(typecast(None, Optional[tp]))
+        self.assertEqual(typecast({'kind': 'dog', 'name': 'rex'}, Optional[tp]),
+                         {'kind': 'dog', 'name': 'rex'})
+        with self.assertRaises(TypeCastError):
+            typecast({'kind': 'cow'}, Optional[tp])
 
     def test_typecast_newtype(self):
         data = "10"
@@ -156,6 +279,80 @@ class TestTypecast(unittest.TestCase):
         data = "12.3"
         with self.assertRaises(TypeCastError):
             typecast(data, tp)
+        self.assertEqual(typecast("10", AdminId), AdminId(UserId(10)))
+
+
+class TestSafeChecks(unittest.TestCase):
+    def test_isinstance_safe(self):
+        self.assertTrue(isinstance_safe(5, int))
+        self.assertTrue(isinstance_safe(5, (str, (int,))))
+        if sys.version_info[:2] >= (3, 10):
+            self.assertTrue(isinstance_safe(5, Union[int, str]))
+            self.assertTrue(isinstance_safe(5, int | str))
+        else:  # 3.9的isinstance不接受typing.Union
+            self.assertFalse(isinstance_safe(5, Union[int, str]))
+        self.assertTrue(isinstance_safe(5, Any))
+        self.assertFalse(isinstance_safe('5', int))
+        self.assertFalse(isinstance_safe([5], list[int]))
+        self.assertFalse(isinstance_safe({}, SampleTypedDict))
+
+    def test_issubclass_safe(self):
+        self.assertTrue(issubclass_safe(bool, int))
+        self.assertTrue(issubclass_safe(bool, (str, (int,))))
+        if sys.version_info[:2] >= (3, 10):
+            self.assertTrue(issubclass_safe(bool, Union[int, str]))
+            self.assertTrue(issubclass_safe(bool, int | str))
+        else:  # 3.9的issubclass不接受typing.Union
+            self.assertFalse(issubclass_safe(bool, Union[int, str]))
+        self.assertTrue(issubclass_safe(SampleTypedDict, dict))
+        self.assertFalse(issubclass_safe(5, int))
+        self.assertFalse(issubclass_safe(list[int], list))
+        self.assertFalse(issubclass_safe(list, list[int]))
+
+
+class CountingRepr:
+    repr_calls = 0
+
+    def __repr__(self):
+        CountingRepr.repr_calls += 1
+        return 'CountingRepr()'
+
+
+class TestTypeCastError(unittest.TestCase):
+    def test_lazy_message(self):
+        data, tp = CountingRepr(), Literal['a']
+        with self.assertRaises(TypeCastError) as cm:
+            typecast(data, tp)
+        self.assertEqual(CountingRepr.repr_calls, 0)
+        message = str(cm.exception)
+        self.assertEqual(CountingRepr.repr_calls, 1)
+        self.assertEqual(message, f'{data=} is not member of {tp=}')
+        self.assertEqual(repr(cm.exception),
+                         repr(TypeCastError(f'{data=} is not member of {tp=}')))
+
+    def test_lazy_args(self):
+        error = TypeCastError.lazy('data={!r} is not member of tp={!r}', 1, 2)
+        self.assertEqual(error.args, ('data=1 is not member of tp=2',))
+        error = TypeCastError.lazy('data={!r}', 1)
+        copied = copy.copy(error)
+        self.assertEqual(copied.args, ('data=1',))
+        self.assertEqual(str(copied), str(error))
+        error.args = ('replaced',)
+        self.assertEqual(str(error), 'replaced')
+
+    def test_plain_args(self):
+        self.assertEqual(str(TypeCastError(1, 2)), '(1, 2)')
+        self.assertEqual(TypeCastError('a', 'b').args, ('a', 'b'))
+
+
+class TestParseCsv(unittest.TestCase):
+    def test_parse_csv(self):
+        self.assertEqual(parse_csv('1,2,3'), ['1', '2', '3'])
+        self.assertEqual(parse_csv('a,,b'), ['a', '', 'b'])
+        self.assertEqual(parse_csv(''), [])
+        self.assertEqual(parse_csv('a,"b,c"'), ['a', 'b,c'])
+        self.assertEqual(parse_csv('1\n'), ['1'])
+        self.assertEqual(parse_csv('1,2\r'), ['1', '2'])
 
 
 class TestSemiJsonSchemaType(unittest.TestCase):
@@ -169,18 +366,22 @@ class TestSemiJsonSchemaType(unittest.TestCase):
     def test_union(self):
         result = semi_json_schema_type(Union[int, str])
         self.assertEqual(
-            result, {'union': [{'type': int}, {'type': str}], 'optional': False})
+            result, {'union': ({'type': int}, {'type': str}), 'optional': False})
+
+        result = semi_json_schema_type(Union[str, int])
+        self.assertEqual(
+            result, {'union': ({'type': str}, {'type': int}), 'optional': False})
 
         result = semi_json_schema_type(Union[int, None])
         self.assertEqual(result, {'type': int, 'optional': True})
 
         result = semi_json_schema_type(Union[None, int, str])
         self.assertEqual(
-            result, {'union': [{'type': int}, {'type': str}], 'optional': True})
+            result, {'union': ({'type': int}, {'type': str}), 'optional': True})
 
     def test_literal(self):
         result = semi_json_schema_type(Literal['a', 'b'])
-        self.assertEqual(result, {'enum': ['a', 'b']})
+        self.assertEqual(result, {'enum': ('a', 'b')})
 
     def test_any(self):
         result = semi_json_schema_type(Any)
@@ -190,6 +391,32 @@ class TestSemiJsonSchemaType(unittest.TestCase):
         result = semi_json_schema_type(SampleElse)
         self.assertEqual(result, {'type': SampleElse})
 
+    def test_cached_readonly(self):
+        tp = list[int]
+        result = semi_json_schema_type(tp)
+        self.assertIs(result, semi_json_schema_type(tp))
+        with self.assertRaises(TypeError):
+            result['type'] = 'object'  # type: ignore
+        tp = Union[int, str]
+        with self.assertRaises(AttributeError):
+            semi_json_schema_type(tp)['union'].append('junk')
+        tp = Literal['a', 'b']
+        with self.assertRaises(AttributeError):
+            semi_json_schema_type(tp)['enum'].clear()
+        self.assertEqual(semi_json_schema_type(tp), {'enum': ('a', 'b')})
+
+    def test_nested_readonly(self):
+        result = semi_json_schema_type(
+            list[Union[int, list[Literal['a', 'b']], None]])
+        union = result['items']['union']
+        enum_schema = {'type': 'array', 'items': {'enum': ('a', 'b')}}
+        self.assertEqual(union, ({'type': int}, enum_schema))
+        self.assertIsInstance(union, tuple)
+        with self.assertRaises(TypeError):
+            union[1]['items']['enum'] = ()  # type: ignore
+        with self.assertRaises(TypeError):
+            result['items']['optional'] = False  # type: ignore
+
 
 if __name__ == '__main__':
     unittest.main()
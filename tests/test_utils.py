@@ -0,0 +1,60 @@
+import py_compile
+
+import pytest
+
+import lessweb.utils
+from lessweb.utils import scan_import
+
+
+def write_package(root, files: dict[str, str]):
+    for relpath, source in files.items():
+        path = root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+
+
+def test_scan_import_module_set(tmp_path, monkeypatch):
+    write_package(tmp_path, {
+        'scanpkg/__init__.py': 'class Root: pass\n',
+        'scanpkg/a.py': 'class A: pass\n',
+        'scanpkg/b.py': 'from scanpkg.a import A\n\ndef f(): pass\n',
+        'scanpkg/sub/__init__.py': '',
+        'scanpkg/sub/c.py': 'class C: pass\n',
+        'scanpkg/no_init/d.py': 'class D: pass\n',
+        'legacy_src/legacy.py': 'class Legacy: pass\n',
+    })
+    py_compile.compile(str(tmp_path / 'legacy_src/legacy.py'),
+                       cfile=str(tmp_path / 'scanpkg/legacy.pyc'))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    result = scan_import(('scanpkg',))
+    assert sorted(result) == ['scanpkg.Root', 'scanpkg.a.A',
+                              'scanpkg.b.f', 'scanpkg.sub.c.C']
+
+
+def test_scan_import_raises_import_error(tmp_path, monkeypatch):
+    write_package(tmp_path, {
+        'brokenpkg/__init__.py': '',
+        'brokenpkg/sub/__init__.py': 'import no_such_module_for_scan\n',
+    })
+    monkeypatch.syspath_prepend(str(tmp_path))
+    with pytest.raises(ImportError, match='no_such_module_for_scan'):
+        scan_import(('brokenpkg',))
+
+
+def test_scan_import_dedup(tmp_path, monkeypatch):
+    write_package(tmp_path, {
+        'duppkg/__init__.py': 'from duppkg.a import A\n',
+        'duppkg/a.py': 'class A: pass\n',
+        'duppkg/b.py': 'from duppkg.a import A\n',
+    })
+    monkeypatch.syspath_prepend(str(tmp_path))
+    seen = []
+    absolute_ref = lessweb.utils.absolute_ref
+
+    def counting_absolute_ref(obj):
+        seen.append(obj)
+        return absolute_ref(obj)
+    monkeypatch.setattr(lessweb.utils, 'absolute_ref', counting_absolute_ref)
+    result = scan_import(('duppkg',))
+    assert list(result) == ['duppkg.a.A']
+    assert len(seen) == 1